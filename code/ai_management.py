@@ -3,19 +3,26 @@ This module handles all AI-related functionality including model initialization,
 conversation management, and tool calls processing.
 """
 
+from config import load_config
 from tools_management import Tools_Class
 from speech_manager import SpeechManager
+from collections import OrderedDict
 import concurrent.futures
+import hashlib
+import threading
+import time
 import streamlit as st
 from openai import OpenAI
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterator, Generator, Optional
 import json
-import yaml
 
-def load_config() -> Dict[str, Any]:
-    """Load configuration from config.yaml"""
-    with open("config.yaml", "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+# Streamed chunks are flushed in batches to limit prints and UI rerenders
+STREAM_BATCH_SIZE = 5
+STREAM_BATCH_INTERVAL = 0.05  # seconds
+
+# Responses are cached per process so identical requests hit across sessions
+_RESPONSE_CACHE: OrderedDict = OrderedDict()
+_RESPONSE_CACHE_LOCK = threading.Lock()
 
 class Ai_Management:
     """Class responsible for managing AI interactions and conversation flow.
@@ -28,9 +35,14 @@ class Ai_Management:
         model (str): Name of the AI model to use
         client (OpenAI): OpenAI API client instance
         temperature (float): Response temperature for model generation
+        max_turns (int): Maximum number of conversation turns kept in history
+        max_tool_result_chars (int): Maximum length of a tool result kept in history
+        response_cache_size (int): Maximum number of entries in the shared response cache
         tools (Tools_Class): Tools management instance
         ai_tools (List[Dict]): Available tool definitions
-        history (List[Dict]): Conversation history
+        stable_prefix (List[Dict]): System prompt and committed conversation turns,
+            shared with `st.session_state["ai_history"]`
+        pending (List[Dict]): Messages of the turn currently in progress
     """
     
     def __init__(self):
@@ -46,6 +58,10 @@ class Ai_Management:
         self.config = load_config()
         self.model = self.config["model"]["name"]
         self.temperature = self.config["model"]["default_temperature"]
+        # At least the current turn is always kept
+        self.max_turns = max(1, int(self.config["model"].get("max_turns", 20)))
+        self.max_tool_result_chars = self.config["model"].get("max_tool_result_chars", 4000)
+        self.response_cache_size = self.config["model"].get("response_cache_size", 128)
     
     def _setup_client(self) -> None:
         """Initialize the OpenAI client with configuration."""
@@ -53,13 +69,60 @@ class Ai_Management:
             base_url=self.config["model"]["base_url"],
             api_key=self.config["model"]["api_key"]
         )
+        # Open the connection in the background so the first message does not pay for it
+        threading.Thread(target=self._warm_up_client, daemon=True).start()
+    
+    def _warm_up_client(self) -> None:
+        """Issue a lightweight request to resolve DNS and open the connection."""
+        try:
+            self.client.with_options(timeout=5, max_retries=0).models.list()
+        except Exception as e:
+            print(f"Error warming up AI client: {e}")
     
     def _initialize_conversation(self) -> None:
         """Initialize conversation history with system prompt."""
         self.system_prompt = [
             {"role": "system", "content": self.config["system_prompt"]}
         ]
-        self.history = self.system_prompt
+        # Rehydrate committed history persisted across Streamlit reruns
+        self.stable_prefix = st.session_state.get("ai_history") or list(self.system_prompt)
+        st.session_state["ai_history"] = self.stable_prefix
+        self.pending = []
+    
+    def reset_conversation(self) -> None:
+        """Reset conversation history to the system prompt only."""
+        # Mutate in place to keep the list shared with the session state
+        self.stable_prefix[:] = self.system_prompt
+        self.pending = []
+    
+    @property
+    def history(self) -> List[Dict]:
+        """Conversation history sent to the model.
+        
+        The stable prefix is never mutated mid-turn so providers can reuse
+        their prompt cache; the turn in progress is appended at the end.
+        """
+        return self.stable_prefix + self.pending
+    
+    def _commit_turn(self) -> None:
+        """Commit the completed turn to the stable prefix."""
+        self.stable_prefix.extend(self.pending)
+        self.pending = []
+        self._trim_history()
+    
+    def _trim_history(self) -> None:
+        """Keep only the system prompt and the last `max_turns` turns.
+        
+        Turns are cut at user messages so tool calls are never separated
+        from their results.
+        """
+        turn_starts = [
+            index for index, message in enumerate(self.stable_prefix)
+            if message["role"] == "user"
+        ]
+        if len(turn_starts) > self.max_turns:
+            first_kept = turn_starts[-self.max_turns]
+            del self.stable_prefix[len(self.system_prompt):first_kept]
     
     def _setup_tools(self) -> None:
         """Initialize tools management system."""
@@ -77,46 +140,115 @@ class Ai_Management:
         Returns:
             str: AI generated response
         """
-        # Add user message to history
-        self.history.append({"role": "user", "content": str(message)})
-        # Get AI response
+        return "".join(self.generation_loop_stream(message))
+    
+    def generation_loop_stream(self, message: str) -> Iterator[str]:
+        """Main processing loop yielding the AI response as it is generated.
+        
+        The first completion is streamed as well, so the common no-tool path
+        displays tokens immediately. Tool calls are rebuilt from the streamed
+        deltas and processed before streaming the final response.
+        
+        Args:
+            message (str): User input message
+            
+        Yields:
+            str: Chunks of the AI generated response
+        """
+        # Start a new turn with the user message, dropping any unfinished turn
+        self.pending = [{"role": "user", "content": str(message)}]
+        # Serve repeated requests from the response cache
+        cache_key = self._response_cache_key()
+        cached_output = self._get_cached_response(cache_key)
+        if cached_output is not None:
+            print("Cached response used")
+            if st.session_state.speech_enabled:
+                self.speech_manager.text_to_speech(cached_output)
+            yield cached_output
+            self.pending.append({"role": "assistant", "content": cached_output})
+            self._commit_turn()
+            return
+        # Get AI response stream
         print("AI is thinking...")
-        response = self.client.chat.completions.create(
+        stream_response = self.client.chat.completions.create(
             model=self.model,
             messages=self.history,
             tools=self.ai_tools,
             temperature=self.temperature,
+            stream=True
         )
         
-        if response.choices[0].message.tool_calls:
+        tool_calls: Dict[int, Dict[str, Any]] = {}
+        ai_output = yield from self._stream_content(stream_response, tool_calls)
+        
+        if tool_calls:
             print("Tool call received and being processed")
-            # Extract tool calls from the response
-            tool_calls = response.choices[0].message.tool_calls
+            # Order tool calls as emitted by the model
+            ordered_tool_calls = [tool_calls[index] for index in sorted(tool_calls)]
             # Add tool calls to history
-            self._add_tool_calls_to_history(tool_calls)
+            self._add_tool_calls_to_history(ordered_tool_calls, ai_output)
             # Process each tool call
-            self._process_tool_calls(tool_calls)
-            # Returns final response
-            return self._generate_final_response()
+            self._process_tool_calls(ordered_tool_calls)
+            # Stream final response
+            yield from self._generate_final_response()
         else:
-            content = response.choices[0].message.content
-            # Speak the AI response if enabled
-            if st.session_state.speech_enabled:
-                with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-                    executor.submit(self.speech_manager.text_to_speech, content)
-            print(content)
             # Add AI response to history
-            self.history.append({"role": "assistant", "content": content})
-            # Return final response
-            return content
+            self.pending.append({"role": "assistant", "content": ai_output})
+            self._store_cached_response(cache_key, ai_output)
+        self._commit_turn()
+    
+    # --- Response Cache ---
+    
+    def _response_cache_key(self) -> str:
+        """Hash the model, temperature and messages of the current request.
+        
+        Returns:
+            str: Cache key for the current request
+        """
+        payload = {
+            "model": self.model,
+            "temperature": self.temperature,
+            "messages": self.history,
+        }
+        return hashlib.blake2b(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+    
+    def _get_cached_response(self, cache_key: str) -> Optional[str]:
+        """Look up a response in the shared cache.
+        
+        Args:
+            cache_key (str): Cache key of the request
+            
+        Returns:
+            Optional[str]: Cached AI response, or None on a miss
+        """
+        with _RESPONSE_CACHE_LOCK:
+            response = _RESPONSE_CACHE.get(cache_key)
+            if response is not None:
+                _RESPONSE_CACHE.move_to_end(cache_key)
+            return response
+    
+    def _store_cached_response(self, cache_key: str, response: str) -> None:
+        """Store a response in the shared cache, evicting the least recently used entries.
+        
+        Args:
+            cache_key (str): Cache key of the request
+            response (str): AI response to store
+        """
+        if self.response_cache_size <= 0 or not response:
+            return
+        with _RESPONSE_CACHE_LOCK:
+            _RESPONSE_CACHE[cache_key] = response
+            _RESPONSE_CACHE.move_to_end(cache_key)
+            while len(_RESPONSE_CACHE) > self.response_cache_size:
+                _RESPONSE_CACHE.popitem(last=False)
     
     # --- Final Response Generation ---
     
-    def _generate_final_response(self) -> str:
+    def _generate_final_response(self) -> Iterator[str]:
         """Generate final response after tool calls.
         
-        Returns:
-            str: Final AI response
+        Yields:
+            str: Chunks of the final AI response
         """
         # AI response stream
         print("AI is thinking...")
@@ -126,79 +258,171 @@ class Ai_Management:
             stream=True
         )
         
-        # Process streaming response
+        ai_output = yield from self._stream_content(stream_response)
+        
+        # Add final AI output to history
+        self.pending.append({"role": "assistant", "content": ai_output})
+    
+    def _stream_content(self, stream_response: Any,
+                        tool_calls: Optional[Dict[int, Dict[str, Any]]] = None) -> Generator[str, None, str]:
+        """Yield content from a streaming response and speak it if enabled.
+        
+        Args:
+            stream_response: Streaming chat completion
+            tool_calls: Optional mapping filled with tool calls rebuilt from the stream
+            
+        Chunks are batched and flushed every `STREAM_BATCH_SIZE` chunks or
+        `STREAM_BATCH_INTERVAL` seconds, whichever comes first.
+        
+        Yields:
+            str: Batched content chunks
+            
+        Returns:
+            str: Full streamed content
+        """
         text = ""
-        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
-        ai_output = ""
+        output_parts: List[str] = []
+        buffer: List[str] = []
+        last_flush = time.monotonic()
         for chunk in stream_response:
-            if chunk.choices[0].delta.content:
-                content = chunk.choices[0].delta.content
-                print(content, end="", flush=True)
-                ai_output += content
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if tool_calls is not None and delta.tool_calls:
+                self._merge_tool_call_deltas(tool_calls, delta.tool_calls)
+            if delta.content:
+                content = delta.content
+                buffer.append(content)
+                output_parts.append(content)
                 text += content
+                if len(buffer) >= STREAM_BATCH_SIZE or time.monotonic() - last_flush >= STREAM_BATCH_INTERVAL:
+                    batch = "".join(buffer)
+                    buffer.clear()
+                    last_flush = time.monotonic()
+                    print(batch, end="", flush=True)
+                    yield batch
                 # Activate text-to-speech if enabled
                 if st.session_state.speech_enabled and text.endswith((".", ";", "!", "?")):
-                    executor.submit(self.speech_manager.text_to_speech, text)
+                    self.speech_manager.text_to_speech(text)
                     text = ""
         
-        # Add final AI output to history
-        self.history.append({"role": "assistant", "content": ai_output})
+        # Flush remaining content
+        if buffer:
+            batch = "".join(buffer)
+            print(batch, end="", flush=True)
+            yield batch
+        
+        # Speak any remaining text
+        if st.session_state.speech_enabled and text.strip():
+            self.speech_manager.text_to_speech(text)
         print("\n"*2)
         
-        return ai_output
+        return "".join(output_parts)
     
     # --- Tool Calls Processing ---
     
-    def _add_tool_calls_to_history(self, tool_calls: List[Any]) -> None:
+    def _merge_tool_call_deltas(self, tool_calls: Dict[int, Dict[str, Any]], deltas: List[Any]) -> None:
+        """Merge streamed tool call deltas into complete tool calls.
+        
+        Args:
+            tool_calls: Mapping of tool call index to tool call being rebuilt
+            deltas: Tool call deltas from a stream chunk
+        """
+        for delta in deltas:
+            tool_call = tool_calls.setdefault(delta.index, {
+                "id": "",
+                "type": "function",
+                "function": {"name": "", "arguments": ""},
+            })
+            if delta.id:
+                tool_call["id"] = delta.id
+            if delta.function:
+                if delta.function.name:
+                    tool_call["function"]["name"] += delta.function.name
+                if delta.function.arguments:
+                    tool_call["function"]["arguments"] += delta.function.arguments
+    
+    def _add_tool_calls_to_history(self, tool_calls: List[Dict[str, Any]], content: str = "") -> None:
         """Add tool calls to conversation history.
         
         Args:
-            tool_calls: List of tool calls from AI response
+            tool_calls: List of tool calls rebuilt from the AI response
+            content (str): Text streamed alongside the tool calls, if any
         """
         tool_call_from_ai = {
             "role": "assistant",
-            "tool_calls": [
-                {
-                    "id": tool_call.id,
-                    "type": tool_call.type,
-                    "function": tool_call.function,
-                }
-                for tool_call in tool_calls
-            ],
+            "content": content or None,
+            "tool_calls": tool_calls,
         }
         # Add tool call to history
-        self.history.append(tool_call_from_ai)
+        self.pending.append(tool_call_from_ai)
     
-    def _process_tool_calls(self, tool_calls: List[Any]) -> None:
-        """Process each tool call and add results to history.
+    def _process_tool_calls(self, tool_calls: List[Dict[str, Any]]) -> None:
+        """Process tool calls concurrently and add results to history.
+        
+        Tools are I/O bound, so they are executed in parallel. Results are
+        appended to history in the order of the tool calls, since chat
+        templates of local models pair results with calls by position.
         
         Args:
             tool_calls: List of tool calls to process
         """
-        for tool_call in tool_calls:
-            # Extract tool call name
-            name_function = tool_call.function.name
-            try:
-                # Extract arguments from tool call
-                args = json.loads(tool_call.function.arguments)
-            except Exception as e:
-                print(f"Error retrieving arguments: {e}")
-                args = {}
-            
-            # Execute the tool call based on its name
-            if name_function == "fetch_wikipedia_information":
-                result = self.tools.fetch_wikipedia_information(args["wikipedia_query"])
-            elif name_function == "fetch_internet_information":
-                result = self.tools.fetch_internet_information(args["query"])
-            elif name_function == "get_current_date_and_time":
-                result = self.tools.get_current_date_and_time()
-            else:
-                result = "Error: not all variables have been provided."
-            
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(tool_calls)) as executor:
+            results = list(executor.map(self._execute_tool_call, tool_calls))
+        
+        for tool_call, result in zip(tool_calls, results):
             # Add result to history
             print(result)
-            self.history.append({
+            self.pending.append({
                 "role": "tool",
-                "content": json.dumps({"status": "success", "message": result}),
-                "tool_call_id": tool_call.id,
+                "content": self._format_tool_result(result),
+                "tool_call_id": tool_call["id"],
             })
+    
+    def _format_tool_result(self, result: Any) -> str:
+        """Format a tool result as plain text for the conversation history.
+        
+        Tool results are sent back on every following turn, so they are kept
+        as raw text and truncated to `max_tool_result_chars`.
+        
+        Args:
+            result: Result returned by the tool
+            
+        Returns:
+            str: Tool message content
+        """
+        content = result if isinstance(result, str) else json.dumps(result)
+        if len(content) > self.max_tool_result_chars:
+            content = content[:self.max_tool_result_chars] + "\n[Result truncated]"
+        return content
+    
+    def _execute_tool_call(self, tool_call: Dict[str, Any]) -> str:
+        """Execute a single tool call.
+        
+        Args:
+            tool_call: Tool call to execute
+            
+        Returns:
+            str: Result of the tool call
+        """
+        # Extract tool call name
+        name_function = tool_call["function"]["name"]
+        try:
+            # Extract arguments from tool call
+            args = json.loads(tool_call["function"]["arguments"] or "{}")
+        except Exception as e:
+            print(f"Error retrieving arguments: {e}")
+            args = {}
+        if not isinstance(args, dict):
+            # Arguments must be a JSON object, e.g. not null or a bare string
+            print(f"Error retrieving arguments: expected an object, got {args!r}")
+            args = {}
+        
+        # Execute the tool call based on its name
+        handler = self.tools.dispatch.get(name_function)
+        if handler is None:
+            return f"Error: unknown tool {name_function}."
+        try:
+            return handler(args)
+        except KeyError as e:
+            return f"Error: missing argument {e}."
@@ -2,13 +2,7 @@
 
 import streamlit as st
 from ai_management import Ai_Management
-from typing import Dict, Any
-import yaml
-
-def load_config() -> Dict[str, Any]:
-    """Load configuration from config.yaml"""
-    with open("config.yaml", "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+from config import load_config
 
 class GUI:
     """Main graphical interface for the NetSourceAI application.
@@ -33,7 +27,7 @@ class GUI:
         self.config = load_config()
         self._setup_page_config()
         self._initialize_session_state()
-        self.ai_chat = Ai_Management()
+        self.ai_chat = st.session_state.ai_chat
     
     def _setup_page_config(self) -> None:
         """Configure Streamlit page settings."""
@@ -48,6 +42,9 @@ class GUI:
             st.session_state.messages = []
         if 'speech_enabled' not in st.session_state:
             st.session_state.speech_enabled = self.config["ui"]["sound_enabled"]
+        # Keep the AI manager across reruns instead of rebuilding it each time
+        if 'ai_chat' not in st.session_state:
+            st.session_state.ai_chat = Ai_Management()
     
     # --- Interface Rendering Methods ---
     
@@ -114,18 +111,19 @@ class GUI:
             user_input (str): User's message
         """
         st.session_state.messages.append({"role": "user", "content": user_input})
+        with st.chat_message("user"):
+            st.write(user_input)
         
-        with st.spinner("💭 Research in progress..."):
-            response = self.ai_chat.generation_loop(user_input)
+        with st.chat_message("assistant"):
+            # Tool calls run before anything is streamed, so keep a visible status
+            with st.spinner("💭 Research in progress..."):
+                response = st.write_stream(self.ai_chat.generation_loop_stream(user_input))
             st.session_state.messages.append({"role": "assistant", "content": response})
-        
-        st.rerun()
     
     def _clear_chat_history(self) -> None:
         """Clear chat history and reset state."""
         st.session_state.messages = []
-        self.ai_chat.history = self.ai_chat.system_prompt
-        st.rerun()
+        self.ai_chat.reset_conversation()
 
 # Application entry point
 if __name__ == "__main__":
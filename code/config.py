@@ -0,0 +1,26 @@
+"""Configuration module for the NetSourceAI chatbot.
+This module loads the application configuration and tool definitions once per process.
+"""
+
+from functools import lru_cache
+from typing import Dict, Any, List
+import json
+import yaml
+
+try:
+    # Use the libyaml C parser when available
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+@lru_cache(maxsize=1)
+def load_config() -> Dict[str, Any]:
+    """Load configuration from config.yaml"""
+    with open("config.yaml", "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+@lru_cache(maxsize=1)
+def load_tools_definition() -> List[Dict]:
+    """Load tool definitions from tools_definition.json"""
+    with open("tools_definition.json", "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -1,14 +1,43 @@
 import pyttsx3
-import markdown
+import queue
+import re
+import threading
+
+# Markdown links are reduced to their text, other markdown syntax is removed
+_MARKDOWN_LINK = re.compile(r'\[([^\]]*)\]\([^)]*\)')
+_MARKDOWN_SYNTAX = re.compile(r'[*_`#>]+')
 
 class SpeechManager:
+    # pyttsx3 is not thread-safe and pyttsx3.init() returns a shared engine,
+    # so a single worker thread per process owns the engine and speaks the
+    # texts queued by every instance in order
+    _queue = queue.Queue()
+    _worker = None
+    _worker_lock = threading.Lock()
+
     def text_to_speech(self, text: str):
-        try:
-            tts_engine = pyttsx3.init()
-            tts_engine.say(self._markdown_to_html(text))
-            tts_engine.runAndWait()
-        except Exception as error:
-            print(f"Error during text-to-speech conversion: {error}")
-
-    def _markdown_to_html(self, markdown_text: str) -> str:
-        return markdown.markdown(markdown_text)
+        self._ensure_worker()
+        SpeechManager._queue.put(text)
+
+    def _ensure_worker(self):
+        with SpeechManager._worker_lock:
+            if SpeechManager._worker is None:
+                SpeechManager._worker = threading.Thread(target=SpeechManager._speak_loop, daemon=True)
+                SpeechManager._worker.start()
+
+    @staticmethod
+    def _speak_loop():
+        tts_engine = None
+        while True:
+            text = SpeechManager._queue.get()
+            try:
+                if tts_engine is None:
+                    tts_engine = pyttsx3.init()
+                tts_engine.say(SpeechManager._markdown_to_text(text))
+                tts_engine.runAndWait()
+            except Exception as error:
+                print(f"Error during text-to-speech conversion: {error}")
+
+    @staticmethod
+    def _markdown_to_text(markdown_text: str) -> str:
+        return _MARKDOWN_SYNTAX.sub('', _MARKDOWN_LINK.sub(r'\1', markdown_text))
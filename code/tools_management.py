@@ -2,20 +2,27 @@
 This module provides a collection of tools for fetching information from various sources.
 """
 
-from bs4 import BeautifulSoup
+from config import load_config, load_tools_definition
 from duckduckgo_search import DDGS
 from datetime import datetime
-from typing import Dict, Any, List, Tuple
-import json
-import yaml
+from collections import Counter
+from typing import Callable, Dict, Any, List, Optional, Tuple
+import concurrent.futures
+import heapq
+import lxml.html
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
 import wikipedia
 
-def load_config() -> Dict[str, Any]:
-    """Load configuration from config.yaml"""
-    with open("config.yaml", "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+# Sentence boundary used to summarize scraped pages
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?]) +')
+_WORD = re.compile(r'\w+')
+_MIN_SENTENCE_WORDS = 4
+# Only the beginning of a page is needed for its summary
+_MAX_PAGE_BYTES = 256 * 1024
+_PAGE_CHUNK_SIZE = 64 * 1024
 
 class Tools_Class:
     """Class responsible for managing and providing various information retrieval tools.
@@ -26,12 +33,20 @@ class Tools_Class:
     Attributes:
         config (Dict[str, Any]): Application configuration
         ai_tools (List[Dict]): List of available tool definitions
+        dispatch (Dict[str, Callable]): Tool handlers keyed by tool name, taking the call arguments
+        _session (requests.Session): HTTP session shared across page fetches
     """
     
     def __init__(self):
         """Initialize tool components and configurations."""
         self.config = load_config()
         self.ai_tools = self._load_tools()
+        self._session = self._create_session()
+        self.dispatch: Dict[str, Callable[[Dict[str, Any]], str]] = {
+            "fetch_wikipedia_information": lambda args: self.fetch_wikipedia_information(args["wikipedia_query"]),
+            "fetch_internet_information": lambda args: self.fetch_internet_information(args["query"]),
+            "get_current_date_and_time": lambda args: self.get_current_date_and_time(),
+        }
     
     def _load_tools(self) -> List[Dict]:
         """Load tool definitions from JSON configuration.
@@ -39,8 +54,23 @@ class Tools_Class:
         Returns:
             List[Dict]: List of tool definitions
         """
-        with open("tools_definition.json", "r", encoding='utf-8') as file:
-            return json.load(file)
+        return load_tools_definition()
+    
+    def _create_session(self) -> requests.Session:
+        """Create an HTTP session with a keep-alive connection pool.
+        
+        Returns:
+            requests.Session: Session shared by concurrent page fetches
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=1, backoff_factor=0.1)
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
     
     # --- Date and Time Method ---
     
@@ -66,22 +96,25 @@ class Tools_Class:
         try:
             with DDGS() as ddgs:
                 # Perform the search using DuckDuckGo
-                results = ddgs.text(
+                results = list(ddgs.text(
                     query,
                     safesearch=self.config["search"]["safesearch"],
                     max_results=self.config["search"]["max_results"]
-                )
-                # Process the results
-                summary = ""
-                for result in results:
-                    # Extract title
-                    title = result.get('title', 'Title not available')
-                    # Extract URL
-                    url = result.get('href', '')
-                    # Extract and summarize content
-                    content = self._get_and_summarize_content(url)
-                    # Append to summary
-                    summary += f"Title: {title}\nURL: {url}\n - Summary: {content}\n\n"
+                ) or [])
+            # Extract and summarize the content of every URL concurrently
+            urls = [result.get('href', '') for result in results]
+            contents = []
+            if urls:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=len(urls)) as executor:
+                    contents = list(executor.map(self._get_and_summarize_content, urls))
+            # Process the results
+            parts: List[str] = []
+            for result, url, content in zip(results, urls, contents):
+                # Extract title
+                title = result.get('title', 'Title not available')
+                # Append to summary
+                parts.append(f"Title: {title}\nURL: {url}\n - Summary: {content}\n\n")
+            summary = "".join(parts)
         except Exception as e:
             # Handle any exceptions that occur during the search
             summary = f"Search error: {e}"
@@ -99,20 +132,104 @@ class Tools_Class:
             str: Summarized content
         """
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            paragraphs = soup.find_all('p')
-            text = ' '.join(para.get_text() for para in paragraphs)
+            content, encoding = self._download_page(url)
+            if not content.strip():
+                return "No content found."
+            tree = lxml.html.fromstring(content, parser=self._html_parser(encoding))
+            text = ' '.join(para.text_content() for para in tree.xpath('//p'))
             
-            sentences = re.split(r'(?<=[.!?]) +', text)
-            if sentences:
-                summary = ' '.join(sentences[:self.config["search"]["num_sentences"]])
-                return summary.strip()
-            return "No content found."
+            summary = self._summarize_text(text, self.config["search"]["num_sentences"])
+            return summary or "No content found."
         except Exception as e:
             return f"Error processing {url}: {e}"
     
+    def _html_parser(self, encoding: Optional[str]) -> Optional[lxml.html.HTMLParser]:
+        """Create an HTML parser decoding with the given charset.
+        
+        Without a charset lxml only detects the encoding from `<meta>` tags.
+        
+        Args:
+            encoding (Optional[str]): Charset declared in the HTTP headers
+            
+        Returns:
+            Optional[lxml.html.HTMLParser]: Parser for the charset, or None for lxml's default
+        """
+        if not encoding:
+            return None
+        try:
+            return lxml.html.HTMLParser(encoding=encoding)
+        except LookupError:
+            # Unknown charset name, let lxml detect the encoding
+            return None
+    
+    def _download_page(self, url: str) -> Tuple[bytes, Optional[str]]:
+        """Download the beginning of a webpage.
+        
+        The body is streamed and reading stops after `_MAX_PAGE_BYTES`, so
+        large pages do not cost more bandwidth or parsing time than needed.
+        
+        Args:
+            url (str): URL to download
+            
+        Returns:
+            Tuple[bytes, Optional[str]]: Raw page content, truncated to
+                `_MAX_PAGE_BYTES`, and the charset declared in the HTTP headers
+        """
+        with self._session.get(url, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            # requests falls back to ISO-8859-1 for text/* without a charset,
+            # so only trust the encoding when the header declares one
+            content_type = response.headers.get('content-type', '').lower()
+            encoding = response.encoding if 'charset' in content_type else None
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(_PAGE_CHUNK_SIZE):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= _MAX_PAGE_BYTES:
+                    break
+        return b''.join(chunks)[:_MAX_PAGE_BYTES], encoding
+    
+    def _summarize_text(self, text: str, num_sentences: int) -> str:
+        """Summarize a text by extracting its most representative sentences.
+        
+        Sentences are scored by the average number of sentences sharing each of
+        their distinct words, so words recurring across the page (the topic)
+        outweigh one-off navigation and boilerplate, and repeating a word within
+        a sentence does not raise its score. Short words are ignored as a
+        language-independent stopword filter.
+        
+        Args:
+            text (str): Text to summarize
+            num_sentences (int): Number of sentences to keep
+            
+        Returns:
+            str: The selected sentences in their original order
+        """
+        if num_sentences <= 0:
+            return ""
+        sentences = [sentence.strip() for sentence in _SENTENCE_SPLIT.split(text) if sentence.strip()]
+        if len(sentences) <= num_sentences:
+            return ' '.join(sentences)
+        
+        sentence_words = [
+            {word for word in _WORD.findall(sentence.lower()) if len(word) > 3}
+            for sentence in sentences
+        ]
+        # Number of sentences containing each word
+        frequencies = Counter(word for words in sentence_words for word in words)
+        # Skip very short fragments such as menu entries when enough sentences remain
+        candidates = [i for i, words in enumerate(sentence_words) if len(words) >= _MIN_SENTENCE_WORDS]
+        if len(candidates) < num_sentences:
+            candidates = list(range(len(sentences)))
+        
+        def score(index: int) -> float:
+            words = sentence_words[index]
+            return sum(frequencies[word] for word in words) / len(words) if words else 0.0
+        
+        selected = heapq.nlargest(num_sentences, candidates, key=score)
+        return ' '.join(sentences[i] for i in sorted(selected))
+    
     # --- Wikipedia Methods ---
     
     def fetch_wikipedia_information(self, wikipedia_query: str) -> str:
@@ -140,13 +257,37 @@ class Tools_Class:
         Returns:
             str: Formatted summaries of Wikipedia pages
         """
-        summary = ""
-        for i, page_name in enumerate(pages[:3]):  # Limit to 3 pages
-            try:
-                page = wikipedia.page(page_name)
-                summary += (f"Page {i+1} - Title: {page.title}\n"
-                          f"URL: {page.url}\n"
-                          f" - Summary: {page.summary}\n\n")
-            except Exception as e:
-                summary += f"Error processing page {page_name}: {e}\n\n"
-        return summary or "No Wikipedia results found."
\ No newline at end of file
+        # Fetch up to 3 pages concurrently
+        pages = pages[:3]
+        if not pages:
+            return "No Wikipedia results found."
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(pages)) as executor:
+            pages_data = list(executor.map(self._fetch_wikipedia_page, pages))
+        
+        parts: List[str] = []
+        for i, (page_name, page, page_summary, error) in enumerate(pages_data):
+            if error is None:
+                parts.append(f"Page {i+1} - Title: {page.title}\n"
+                             f"URL: {page.url}\n"
+                             f" - Summary: {page_summary}\n\n")
+            else:
+                parts.append(f"Error processing page {page_name}: {error}\n\n")
+        return "".join(parts) or "No Wikipedia results found."
+    
+    def _fetch_wikipedia_page(self, page_name: str) -> Tuple[str, Any, Optional[str], Optional[Exception]]:
+        """Fetch a Wikipedia page and its summary.
+        
+        Args:
+            page_name (str): Wikipedia page title
+            
+        Returns:
+            Tuple[str, Any, Optional[str], Optional[Exception]]: Page title, page,
+                page summary and error if any
+        """
+        try:
+            # Titles come from the search results, so auto-suggest is not needed
+            page = wikipedia.page(page_name, auto_suggest=False)
+            # Load the summary inside the worker thread
+            return page_name, page, page.summary, None
+        except Exception as e:
+            return page_name, None, None, e